@@ -0,0 +1,31 @@
+import time
+from importlib import import_module
+from typing import Dict, Iterable, Optional
+
+DSLS = ("matching.text", "transformation.text")
+
+
+def warmup(dsls: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Load and prime wrapped DSLs.
+
+    The first synthesis and execution calls on a DSL are slow because
+    assemblies are loaded and code is JIT compiled lazily. This runs
+    a tiny synthesis and execution for each DSL, so that later calls
+    don't pay for it.
+
+    Args:
+        dsls: Names of DSLs to prime, any of ``pyprose.DSLS``. All
+            are primed if not given.
+
+    Returns:
+        Time in seconds it took to prime each DSL.
+
+    """
+    timings = dict()
+    for dsl in DSLS if dsls is None else dsls:
+        if dsl not in DSLS:
+            raise ValueError("Unknown DSL {}.".format(dsl))
+        start = time.perf_counter()
+        import_module("." + dsl, __name__).warmup()
+        timings[dsl] = time.perf_counter() - start
+    return timings
@@ -0,0 +1,160 @@
+"""Thin client for :mod:`pyprose.server`.
+
+Mirrors the ``learn_program`` and ``learn_patterns`` functions, but
+runs them in a warm server process. Importing this module does not
+load the CLR.
+
+>>> with Client() as client:
+...     p = client.learn_program([(["Kettil Hansson"], "Hansson, K.")])
+...     p(["Etelka Bala"])
+'Bala, E.'
+
+"""
+
+import re
+import socket
+import threading
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import protocol
+from .server import default_socket
+
+
+class ServerError(Exception):
+    """Raised when the server fails to handle a request."""
+
+
+class Client:
+    """Connection to a running server.
+
+    Args:
+        path: Path of the Unix socket the server listens on,
+            :func:`pyprose.server.default_socket` if not given.
+
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path or default_socket())
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the connection, releasing all programs on the server."""
+        self._socket.close()
+
+    def request(self, operation: str, *arguments: Any) -> Any:
+        """Send a request and wait for its response."""
+        with self._lock:
+            protocol.send(self._socket, [operation, *arguments])
+            status, value = protocol.receive(self._socket)
+        if status != "ok":
+            raise ServerError(value)
+        return value
+
+    def learn_program(
+        self, examples: Iterable[Tuple[Union[List[str], str], Optional[str]]]
+    ) -> Optional["RemoteProgram"]:
+        """Learn a single text transformation program.
+
+        Args:
+            examples: Pairs of an input row and an output, where the
+                output is `None` for input only examples.
+
+        Returns:
+            A program if one is found, `None` otherwise.
+
+        """
+        examples = [
+            [[i] if isinstance(i, str) else list(i), o] for i, o in examples
+        ]
+        result = self.request("learn_program", examples)
+        if result is None:
+            return None
+        return RemoteProgram(self, *result)
+
+    def learn_patterns(
+        self, strings: Iterable[str], **options: Any
+    ) -> List["RemotePattern"]:
+        """Learn patterns from strings.
+
+        Takes the same keyword arguments as
+        :func:`pyprose.matching.text.learn_patterns`, except that
+        `allowed_tokens` is a list of `(regex, name, score)` tuples.
+        Unless `max_examples` is given, the server only returns a few
+        examples for each pattern.
+
+        """
+        if options.get("allowed_tokens") is not None:
+            options["allowed_tokens"] = [list(t) for t in options["allowed_tokens"]]
+        return [
+            RemotePattern(**pattern)
+            for pattern in self.request("learn_patterns", list(strings), options)
+        ]
+
+
+class RemoteProgram:
+    """A text transformation program that lives on the server."""
+
+    def __init__(self, client: Client, i: int, uses_columns: List[int]):
+        self._client = client
+        self._id = i
+        self.uses_columns = uses_columns
+
+    def __call__(self, row: Union[List[str], str]) -> Optional[str]:
+        return self.run([row])[0]
+
+    def run(self, rows: Sequence[Union[List[str], str]]) -> List[Optional[str]]:
+        """Transform many rows in a single request."""
+        rows = [[row] if isinstance(row, str) else list(row) for row in rows]
+        return self._client.request("run_program", self._id, rows)
+
+    def __enter__(self) -> "RemoteProgram":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Free this program on the server."""
+        self._client.request("release_program", self._id)
+
+
+class RemotePattern:
+    """Snapshot of a pattern learned by the server."""
+
+    def __init__(
+        self,
+        regex: str,
+        exclude: List[str],
+        description: str,
+        matching_fraction: float,
+        examples: List[str],
+    ):
+        self.regex = regex
+        self.exclude = exclude
+        self.description = description
+        self.matching_fraction = matching_fraction
+        self.examples = examples
+
+    def __call__(self, string: str) -> bool:
+        return self.matches(string)
+
+    def __repr__(self) -> str:
+        return self.regex
+
+    def matches(self, string: str) -> bool:
+        """Check if this pattern matches a given string."""
+        return (re.match(self.regex, string) is not None) and not any(
+            re.match(e, string) is not None for e in self.exclude
+        )
+
+    @property
+    def example(self) -> Optional[str]:
+        """One example of a matched input string."""
+        return next(iter(self.examples), None)
@@ -1,4 +1,5 @@
-from typing import Callable, Any
+from contextlib import contextmanager
+from typing import Callable, Any, Iterator
 import pyprose.dependencies
 
 dependencies = {
@@ -28,9 +29,65 @@ class ProseProgram:
         self._runner = runner
 
     def __call__(self, i: Any):
-        return self._runner(self._program, i)
+        return self._runner(self.program, i)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the wrapped program.
+
+        The program can no longer be used afterwards.
+
+        """
+        self._program = None
+
+    @property
+    def program(self) -> Program:
+        """The wrapped ``Microsoft.ProgramSynthesis.Program``.
+
+        Raises:
+            ValueError: If this program is closed.
+
+        """
+        if self._program is None:
+            raise ValueError("Program is closed.")
+        return self._program
 
     @property
     def score(self) -> float:
         """Ranking score of this program, higher is better."""
-        return self._program.Score
+        return self.program.Score
+
+
+def close_session(session: Any):
+    """Release inputs and constraints held by a PROSE session.
+
+    Learned programs are independent of the session, but other results,
+    such as the ``PatternInfo`` objects of ``Matching.Text``, may refer
+    back to its inputs. Wrappers therefore copy everything they need out
+    of such results before the session is closed, and never read from
+    them afterwards.
+
+    """
+    session.Constraints.Clear()
+    session.Inputs.Clear()
+    if hasattr(session, "Dispose"):
+        session.Dispose()
+
+
+@contextmanager
+def closing_session(session: Any) -> Iterator[Any]:
+    """Context manager that closes a session on exit.
+
+    Results have to be converted or wrapped before leaving
+    the context.
+
+    """
+    try:
+        yield session
+    finally:
+        close_session(session)
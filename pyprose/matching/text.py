@@ -1,8 +1,11 @@
 """This module implements the FlashProfile algorithm."""
 
 import re
-from typing import List, Iterable, Union, Optional
+import heapq
+from itertools import combinations, count, islice
+from typing import Dict, List, Iterable, Iterator, Tuple, Union, Optional
 
+from ..core import closing_session
 from ..dependencies import load
 
 dependencies = {
@@ -30,19 +33,60 @@ from Microsoft.ProgramSynthesis.Matching.Text.Semantics import (  # type: ignore
 )
 from Microsoft.ProgramSynthesis.Matching.Text.Constraints import IncludeOutlierPatterns  # type: ignore
 
+# number of examples copied into each pattern unless requested otherwise
+DEFAULT_MAX_EXAMPLES = 10
 
 class Pattern:
-    """Wrapper around PatternInfo."""
+    """Snapshot of a PatternInfo.
 
-    def __init__(self, pattern: PatternInfo):
-        self._pattern = pattern
+    All information is copied out of the ``PatternInfo`` when the
+    pattern is created and no reference to it is kept, so neither it
+    nor the session that learned it are kept alive. Only the first
+    `max_examples` input strings are copied, so a pattern stays small
+    even if it matches many strings.
+
+    Args:
+        pattern: The ``PatternInfo`` to copy.
+        max_examples: Maximal number of examples kept by this pattern.
+            If `None`, all are kept.
+
+    """
+
+    def __init__(
+        self, pattern: PatternInfo, max_examples: Optional[int] = DEFAULT_MAX_EXAMPLES
+    ):
+        self._regex = pattern.Regex
+        self._exclude = list(pattern.RegexesToExclude)
+        self._description = pattern.Description
+        self._tokens = list(pattern.DescriptionTokens)
+        self._matching_fraction = pattern.MatchingFraction
+        self._examples = list(islice(pattern.Examples, max_examples))
+        self._closed = False
 
     def __call__(self, string: str) -> bool:
         return self.matches(string)
 
     def __repr__(self) -> str:
+        if self._closed:
+            return "<closed pattern>"
         return self.regex
 
+    def __enter__(self) -> "Pattern":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the examples and tokens of this pattern.
+
+        The pattern can no longer be used afterwards.
+
+        """
+        self._tokens = None
+        self._examples = None
+        self._closed = True
+
     def matches(self, string: str) -> bool:
         """Check if this pattern matches a given string.
 
@@ -68,10 +112,43 @@ class Pattern:
             if not any(re.match(e, candidate) for e in self.exclude)
         ]
 
+    def spans(
+        self, buffer: Union[bytes, bytearray, memoryview]
+    ) -> Iterator[Tuple[int, int]]:
+        """Lazily find byte offsets of all matches in a buffer.
+
+        The regex is translated to a bytes regex over UTF-8 encoded text,
+        so any object supporting the buffer protocol, such as an ``mmap``,
+        can be scanned without decoding or copying it. Character classes
+        such as ``\\d`` and ``\\w`` then only match ASCII characters, while
+        ``.`` and negated classes match whole multi-byte characters. Spans
+        therefore never end inside a character.
+
+        Args:
+            buffer: UTF-8 encoded text to extract patterns from.
+
+        Returns:
+            An iterator of `(start, end)` offsets.
+
+        Raises:
+            ValueError: If the regex contains non-ASCII characters, which
+                cannot be translated.
+
+        """
+        regex = re.compile(_to_bytes_regex(self.regex[1:-1]))
+        exclude = self._bytes_exclude()
+        for match in regex.finditer(buffer):
+            if exclude:
+                candidate = match.group()
+                if any(e.match(candidate) for e in exclude):
+                    continue
+            yield match.span()
+
     @property
     def description(self) -> str:
         """Generate a readable description."""
-        return self._pattern.Description
+        self._check_open()
+        return self._description
 
     @property
     def tokens(self) -> List[IToken]:
@@ -80,31 +157,240 @@ class Pattern:
         TODO: Convert these to `Token` objects.
 
         """
-        return self._pattern.DescriptionTokens
+        self._check_open()
+        return self._tokens
 
     @property
     def regex(self) -> str:
         """Generate a regular expression."""
-        return self._pattern.Regex
+        self._check_open()
+        return self._regex
 
     @property
-    def exclude(self) -> str:
-        return list(self._pattern.RegexesToExclude)
+    def exclude(self) -> List[str]:
+        self._check_open()
+        return self._exclude
 
     @property
     def matching_fraction(self) -> float:
         """Percentage of input strings that this pattern matches."""
-        return self._pattern.MatchingFraction
+        self._check_open()
+        return self._matching_fraction
 
     @property
     def examples(self) -> List[str]:
-        """List of all input strings that this pattern matches."""
-        return list(self._pattern.Examples)
+        """List of input strings that this pattern matches.
+
+        Contains at most `max_examples` strings.
+
+        """
+        return list(self.iter_examples())
 
     @property
-    def example(self) -> str:
+    def example(self) -> Optional[str]:
         """One example of a matched input string."""
-        return next(iter(self.examples), None)
+        return next(self.iter_examples(), None)
+
+    def iter_examples(self) -> Iterator[str]:
+        """Iterate over the examples kept by this pattern.
+
+        Yields the same strings as :attr:`examples` without copying them
+        into a new list.
+
+        """
+        self._check_open()
+        return iter(self._examples)
+
+    def _bytes_exclude(self) -> List["re.Pattern"]:
+        return [re.compile(_to_bytes_regex(e)) for e in self.exclude]
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("Pattern is closed.")
+
+
+class PatternMatcher:
+    """Find the first of many patterns that matches a string.
+
+    All patterns are compiled into a single regular expression, so
+    each string is scanned once rather than once per pattern. If the
+    regexes cannot be combined, for example because one of them starts
+    with an inline flag, patterns are matched one by one instead.
+
+    Args:
+        patterns: Patterns to match, in order of preference.
+
+    """
+
+    def __init__(self, patterns: Iterable[Pattern]):
+        self._patterns = list(patterns)
+        try:
+            self._regex = re.compile(
+                "|".join(
+                    "(?P<p{}>{})".format(i, pattern.regex[1:-1])
+                    for i, pattern in enumerate(self._patterns)
+                )
+            )
+        except re.error:
+            self._regex = None
+        self._exclude = [pattern.exclude for pattern in self._patterns]
+
+    def __call__(self, string: str) -> Optional[int]:
+        return self.match(string)
+
+    def match(self, string: str) -> Optional[int]:
+        """Index of the first pattern matching `string`, if any."""
+        if self._regex is None:
+            return self._match_from(string, 0)
+        match = self._regex.fullmatch(string)
+        if match is None:
+            return None
+        i = int(match.lastgroup[1:])
+        if not any(re.match(e, string) for e in self._exclude[i]):
+            return i
+        # excluded, so fall back to checking remaining patterns
+        return self._match_from(string, i + 1)
+
+    def _match_from(self, string: str, start: int) -> Optional[int]:
+        """Check patterns one by one, starting at `start`."""
+        return next(
+            (
+                i
+                for i in range(start, len(self._patterns))
+                if self._patterns[i].matches(string)
+            ),
+            None,
+        )
+
+
+def extract_spans(
+    patterns: Iterable[Pattern],
+    buffer: Union[bytes, bytearray, memoryview],
+    overlapping: bool = False,
+) -> Iterator[Tuple[int, int, int]]:
+    """Lazily find matches of many patterns in a buffer.
+
+    By default, all patterns are combined into a single regex and the
+    buffer is scanned once. Matches then do not overlap: at each offset,
+    the first pattern that matches is reported. With `overlapping`, each
+    pattern is scanned separately as in :meth:`Pattern.spans`, which
+    finds all matches of every pattern but scans the buffer once per
+    pattern. See :meth:`Pattern.spans` for how regexes are translated.
+
+    Args:
+        patterns: Patterns to extract.
+        buffer: UTF-8 encoded text to extract patterns from.
+        overlapping: Whether to report matches of different patterns
+            that overlap.
+
+    Returns:
+        An iterator of `(start, end, pattern_index)` tuples, ordered by
+        offset, where `pattern_index` is the position of the matching
+        pattern in `patterns`.
+
+    """
+    patterns = list(patterns)
+    if overlapping:
+        return heapq.merge(
+            *(
+                _tag_spans(pattern.spans(buffer), i)
+                for i, pattern in enumerate(patterns)
+            )
+        )
+    return _extract_spans_combined(patterns, buffer)
+
+
+def _tag_spans(
+    spans: Iterator[Tuple[int, int]], i: int
+) -> Iterator[Tuple[int, int, int]]:
+    return ((start, end, i) for start, end in spans)
+
+
+def _extract_spans_combined(
+    patterns: List[Pattern], buffer: Union[bytes, bytearray, memoryview]
+) -> Iterator[Tuple[int, int, int]]:
+    regex = re.compile(
+        b"|".join(
+            b"(?P<p%d>%s)" % (i, _to_bytes_regex(pattern.regex[1:-1]))
+            for i, pattern in enumerate(patterns)
+        )
+    )
+    exclude = [pattern._bytes_exclude() for pattern in patterns]
+    for match in regex.finditer(buffer):
+        i = int(match.lastgroup[1:])
+        if exclude[i]:
+            candidate = match.group()
+            if any(e.match(candidate) for e in exclude[i]):
+                continue
+        yield match.start(), match.end(), i
+
+
+# any multi-byte UTF-8 encoded character
+_MULTIBYTE = r"[\xc0-\xff][\x80-\xbf]+"
+
+# ASCII classes that would match single non-ASCII bytes in a bytes regex
+_NEGATED_ESCAPES = {"D": "0-9", "W": "a-zA-Z0-9_", "S": " \\t\\n\\r\\f\\v"}
+
+
+def _to_bytes_regex(regex: str) -> bytes:
+    """Translate a regex to an equivalent regex over UTF-8 bytes.
+
+    Every construct that can match a non-ASCII character in `regex`,
+    which is ``.``, negated classes and ``\\D``, ``\\W`` and ``\\S``, is
+    rewritten to match either a single ASCII byte or a complete UTF-8
+    encoded character. Other constructs only match ASCII bytes.
+
+    Raises:
+        ValueError: If `regex` contains non-ASCII characters or escapes.
+
+    """
+    if not regex.isascii() or re.search(r"\\[uUN]|\\x[89a-fA-F]", regex):
+        raise ValueError("Cannot match non-ASCII regex {!r} on bytes.".format(regex))
+    parts = list()
+    i = 0
+    while i < len(regex):
+        c = regex[i]
+        if c == "\\":
+            escape = regex[i : i + 2]
+            if escape[1:] in _NEGATED_ESCAPES:
+                parts.append(_negated_class(_NEGATED_ESCAPES[escape[1:]]))
+            else:
+                parts.append(escape)
+            i += 2
+        elif c == ".":
+            parts.append(_negated_class("\\n"))
+            i += 1
+        elif c == "[":
+            j = i + 1
+            negated = regex[j : j + 1] == "^"
+            if negated:
+                j += 1
+            start = j
+            # a leading ] is part of the class
+            if regex[j : j + 1] == "]":
+                j += 1
+            while regex[j] != "]":
+                j += 2 if regex[j] == "\\" else 1
+            content = regex[start:j]
+            if re.search(r"\\[DWS]", content):
+                raise ValueError("Cannot match class [{}] on bytes.".format(content))
+            if negated:
+                parts.append(_negated_class(content))
+            else:
+                parts.append("[{}]".format(content))
+            i = j + 1
+        else:
+            parts.append(c)
+            i += 1
+    return "".join(parts).encode("ascii")
+
+
+def _negated_class(content: str) -> str:
+    # the range goes first, so a trailing - in `content` stays literal,
+    # but a leading ] then has to be escaped
+    if content.startswith("]"):
+        content = "\\" + content
+    return "(?:[^\\x80-\\xff{}]|{})".format(content, _MULTIBYTE)
 
 
 class Token:
@@ -152,7 +438,7 @@ class Token:
     @classmethod
     def default_tokens(cls) -> List[str]:
         """Get list of default tokens."""
-        return [t.Value for t in DefaultTokens.AllTokensPythonNames]
+        return list(_default_token_scores())
 
     @classmethod
     def default_token_score(cls, token: str) -> float:
@@ -162,10 +448,7 @@ class Token:
             token: Any of the `Token.default_tokens`.
 
         """
-        token = next(
-            t.Key.Score for t in DefaultTokens.AllTokensPythonNames if t.Value == token
-        )
-        return token
+        return _default_token_scores()[token]
 
     @classmethod
     def from_characters(
@@ -182,20 +465,100 @@ class Token:
         return cls(re.escape(string), name, score)
 
 
+class TokenSet:
+    """A reusable collection of tokens.
+
+    The tokens are converted to a .NET array once, on first use,
+    which is then shared by all sessions that use this set.
+
+    >>> tokens = TokenSet([Token.from_characters("abc", "ABC")])
+    >>> patterns = [learn_patterns(column, allowed_tokens=tokens) for column in columns]
+
+    Args:
+        tokens: Tokens in this set.
+
+    """
+
+    def __init__(self, tokens: Iterable[Token]):
+        self._tokens = list(tokens)
+        self._prose = None
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(self._tokens)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def to_prose(self) -> Array:
+        """Convert to an ``IToken[]``."""
+        if self._prose is None:
+            self._prose = Array[IToken]([token.to_prose() for token in self._tokens])
+        return self._prose
+
+
+# number of strings per cluster used to compare merged patterns
+_SAMPLE = 20
+
+
+class PatternHierarchy:
+    """Patterns learned at increasing levels of generality.
+
+    The first level contains the patterns learned by FlashProfile. Every
+    next level is obtained by merging two patterns of the previous level
+    into a single, more general pattern, until the requested number of
+    patterns is reached.
+
+    Args:
+        levels: Lists of patterns, from most specific to most general.
+        children: Maps each merged pattern to the patterns it replaces.
+
+    """
+
+    def __init__(
+        self, levels: List[List[Pattern]], children: Dict[Pattern, List[Pattern]]
+    ):
+        self._levels = levels
+        self._children = children
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __getitem__(self, level: int) -> List[Pattern]:
+        return self._levels[level]
+
+    @property
+    def patterns(self) -> List[Pattern]:
+        """Most general level of patterns."""
+        return self._levels[-1]
+
+    def at_most(self, k: int) -> List[Pattern]:
+        """Most specific level with at most `k` patterns."""
+        return next(
+            (level for level in self._levels if len(level) <= k), self.patterns
+        )
+
+    def children(self, pattern: Pattern) -> List[Pattern]:
+        """Patterns that were merged into `pattern`."""
+        return self._children.get(pattern, [])
+
+
 def learn_patterns(
     strings: Iterable[str],
-    allowed_tokens: Optional[Iterable[Token]] = None,
+    allowed_tokens: Optional[Union[TokenSet, Iterable[Token]]] = None,
     in_different_clusters: Optional[List[List[str]]] = None,
     in_same_clusters: Optional[List[List[str]]] = None,
     include_outlier_patterns: bool = False,
     outlier_limit: Optional[float] = None,
+    max_examples: Optional[int] = DEFAULT_MAX_EXAMPLES,
+    max_patterns: Optional[int] = None,
 ) -> List[Pattern]:
     """Learn patterns from strings.
 
     Args:
         strings: A list of strings.
         allowed_tokens: List of tokens allowed tokens. See :class:`Token` for more
-            information on how to create new token classes.
+            information on how to create new token classes. Pass a :class:`TokenSet`
+            to reuse the same tokens across many calls.
         in_different_cluster: List of lists of strings that should be in
             different clusters.
         in_same_cluster: List of lists of strings that should be in the
@@ -204,42 +567,195 @@ def learn_patterns(
             the original documentation: *This may produce some low quality patterns.
             Furthermore, it makes it more likely that we have overlapping patterns.*
         outlier_limit: Allow patterns to not match this fraction of values.
+        max_examples: Maximal number of examples kept by each pattern.
+            If `None`, all are kept.
+        max_patterns: Maximal number of patterns to return. If more are
+            learned, they are merged as in :func:`learn_pattern_hierarchy`.
 
     """
-    session = _make_session(
-        strings,
-        allowed_tokens=allowed_tokens,
-        in_different_clusters=in_different_clusters,
-        in_same_clusters=in_same_clusters,
-        include_outlier_patterns=include_outlier_patterns,
-        outlier_limit=outlier_limit,
-    )
-    return [Pattern(pattern) for pattern in session.LearnPatterns()]
+    if max_patterns is not None:
+        return learn_pattern_hierarchy(
+            strings,
+            max_patterns,
+            allowed_tokens=allowed_tokens,
+            in_different_clusters=in_different_clusters,
+            in_same_clusters=in_same_clusters,
+            include_outlier_patterns=include_outlier_patterns,
+            outlier_limit=outlier_limit,
+            max_examples=max_examples,
+        ).patterns
+    with closing_session(
+        _make_session(
+            strings,
+            allowed_tokens=allowed_tokens,
+            in_different_clusters=in_different_clusters,
+            in_same_clusters=in_same_clusters,
+            include_outlier_patterns=include_outlier_patterns,
+            outlier_limit=outlier_limit,
+        )
+    ) as session:
+        return [
+            Pattern(pattern, max_examples=max_examples)
+            for pattern in session.LearnPatterns()
+        ]
+
+
+def learn_pattern_hierarchy(
+    strings: Iterable[str],
+    max_patterns: int = 1,
+    allowed_tokens: Optional[Union[TokenSet, Iterable[Token]]] = None,
+    in_different_clusters: Optional[List[List[str]]] = None,
+    in_same_clusters: Optional[List[List[str]]] = None,
+    include_outlier_patterns: bool = False,
+    outlier_limit: Optional[float] = None,
+    max_examples: Optional[int] = DEFAULT_MAX_EXAMPLES,
+) -> PatternHierarchy:
+    """Learn a hierarchy of patterns with at most `max_patterns` at the top.
+
+    Starting from the patterns found by :func:`learn_patterns`, two
+    patterns are repeatedly replaced by a single pattern learned on the
+    strings of both. The pair whose merged pattern stays most specific,
+    that is, matches the fewest sampled strings of the other clusters,
+    is merged first. Each merge yields a new level in the hierarchy, so
+    callers can choose between precision and the number of patterns
+    without learning again.
+
+    Clusters are only ever merged, so `in_same_clusters` remains
+    satisfied. Pairs that would put strings of `in_different_clusters`
+    together are never merged, which means that the most general level
+    can have more than `max_patterns` patterns.
+
+    Candidate merges are scored on patterns learned from a small sample
+    of the strings of both clusters, so only the chosen merge is learned
+    on all strings. Pairs for which no pattern is found are skipped.
+
+    Args:
+        strings: A list of strings.
+        max_patterns: Maximal number of patterns at the most general level.
+
+    """
+    if allowed_tokens is not None and not isinstance(allowed_tokens, TokenSet):
+        allowed_tokens = TokenSet(allowed_tokens)
+    max_patterns = max(max_patterns, 1)
+    with closing_session(
+        _make_session(
+            strings,
+            allowed_tokens=allowed_tokens,
+            in_different_clusters=in_different_clusters,
+            in_same_clusters=in_same_clusters,
+            include_outlier_patterns=include_outlier_patterns,
+            outlier_limit=outlier_limit,
+        )
+    ) as session:
+        infos = list(session.LearnPatterns())
+        # only materialise the strings of each cluster if they are merged
+        merge = len(infos) > max_patterns
+        clusters = {
+            i: (
+                Pattern(info, max_examples=max_examples),
+                list(info.Examples) if merge else None,
+            )
+            for i, info in enumerate(infos)
+        }
+    levels = [[pattern for pattern, _ in clusters.values()]]
+    children = dict()
+    if not merge:
+        return PatternHierarchy(levels, children)
+
+    different = [set(group) for group in in_different_clusters or []]
+    groups = {
+        i: {g for g, group in enumerate(different) if not group.isdisjoint(cluster)}
+        for i, (_, cluster) in clusters.items()
+    }
+    samples = {i: cluster[:_SAMPLE] for i, (_, cluster) in clusters.items()}
+    # merged clusters keep the samples of both, so the cost of a pair
+    # stays valid until one of its clusters is merged
+    costs = dict()
+    ids = count(len(clusters))
+
+    def cost(a: int, b: int) -> Optional[Tuple[int, int]]:
+        pattern = learn_pattern(
+            samples[a] + samples[b], allowed_tokens=allowed_tokens, max_examples=0
+        )
+        if pattern is None:
+            return None
+        with pattern:
+            matched = sum(
+                pattern.matches(string)
+                for i, sample in samples.items()
+                if i != a and i != b
+                for string in sample
+            )
+        return matched, len(clusters[a][1]) + len(clusters[b][1])
+
+    while len(clusters) > max_patterns:
+        for a, b in combinations(clusters, 2):
+            if (a, b) not in costs and not groups[a] & groups[b]:
+                costs[a, b] = cost(a, b)
+        candidates = [(c, pair) for pair, c in costs.items() if c is not None]
+        if not candidates:
+            break
+        _, (a, b) = min(candidates)
+        pattern = learn_pattern(
+            clusters[a][1] + clusters[b][1],
+            allowed_tokens=allowed_tokens,
+            max_examples=max_examples,
+        )
+        if pattern is None:
+            costs[a, b] = None
+            continue
+        children[pattern] = [clusters[a][0], clusters[b][0]]
+        i = next(ids)
+        clusters[i] = (pattern, clusters.pop(a)[1] + clusters.pop(b)[1])
+        groups[i] = groups.pop(a) | groups.pop(b)
+        samples[i] = samples.pop(a) + samples.pop(b)
+        costs = {
+            pair: c for pair, c in costs.items() if a not in pair and b not in pair
+        }
+        levels.append([pattern for pattern, _ in clusters.values()])
+    return PatternHierarchy(levels, children)
 
 
 def learn_pattern(
     strings: Iterable[str],
-    allowed_tokens: Optional[Iterable[Token]] = None,
+    allowed_tokens: Optional[Union[TokenSet, Iterable[Token]]] = None,
     in_different_clusters: Optional[List[List[str]]] = None,
     in_same_clusters: Optional[List[List[str]]] = None,
     include_outlier_patterns: bool = False,
     outlier_limit: Optional[float] = None,
-) -> Pattern:
-    """Learn a single pattern matching all examples."""
-    session = _make_session(
-        strings,
-        allowed_tokens=allowed_tokens,
-        in_different_clusters=in_different_clusters,
-        in_same_clusters=in_same_clusters,
-        include_outlier_patterns=include_outlier_patterns,
-        outlier_limit=outlier_limit,
-    )
-    return Pattern(session.LearnPattern())
+    max_examples: Optional[int] = DEFAULT_MAX_EXAMPLES,
+) -> Optional[Pattern]:
+    """Learn a single pattern matching all examples.
+
+    Returns:
+        A pattern if one is found, `None` otherwise.
+
+    """
+    with closing_session(
+        _make_session(
+            strings,
+            allowed_tokens=allowed_tokens,
+            in_different_clusters=in_different_clusters,
+            in_same_clusters=in_same_clusters,
+            include_outlier_patterns=include_outlier_patterns,
+            outlier_limit=outlier_limit,
+        )
+    ) as session:
+        pattern = session.LearnPattern()
+        if pattern is None:
+            return None
+        return Pattern(pattern, max_examples=max_examples)
+
+
+def warmup():
+    """Run a tiny synthesis and match, see :func:`pyprose.warmup`."""
+    for pattern in learn_patterns(["1992", "Feb-03"]):
+        pattern.matches("2001")
 
 
 def _make_session(
     strings: Iterable[str],
-    allowed_tokens: Optional[Iterable[Token]] = None,
+    allowed_tokens: Optional[Union[TokenSet, Iterable[Token]]] = None,
     in_different_clusters: Optional[List[List[str]]] = None,
     in_same_clusters: Optional[List[List[str]]] = None,
     include_outlier_patterns: bool = False,
@@ -257,10 +773,9 @@ def _make_session(
         session.Inputs.Add(string)
 
     if allowed_tokens is not None:
-        itokens = list()
-        for tokens in allowed_tokens:
-            itokens.append(tokens.to_prose())
-        session.Constraints.Add(AllowedTokens[str, bool](Array[IToken](itokens)))
+        if not isinstance(allowed_tokens, TokenSet):
+            allowed_tokens = TokenSet(allowed_tokens)
+        session.Constraints.Add(AllowedTokens[str, bool](allowed_tokens.to_prose()))
 
     if in_different_clusters is not None:
         for different in in_different_clusters:
@@ -277,3 +792,16 @@ def _make_session(
         session.Constraints.Add(OutlierLimit[str, bool](outlier_limit))
 
     return session
+
+
+_default_scores: Optional[Dict[str, float]] = None
+
+
+def _default_token_scores() -> Dict[str, float]:
+    """Scores of the default tokens by name, computed on first use."""
+    global _default_scores
+    if _default_scores is None:
+        _default_scores = {
+            t.Value: t.Key.Score for t in DefaultTokens.AllTokensPythonNames
+        }
+    return _default_scores
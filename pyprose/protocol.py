@@ -0,0 +1,124 @@
+"""Binary protocol used between :mod:`pyprose.server` and :mod:`pyprose.client`.
+
+Every message is a frame consisting of a four byte big-endian length
+followed by a single encoded value. Values are tagged with one byte.
+
+    * ``N``: None.
+    * ``T`` and ``F``: booleans.
+    * ``i``: a signed 64 bit integer.
+    * ``f``: a double.
+    * ``s``: a four byte length followed by an UTF-8 encoded string.
+    * ``l``: a four byte length followed by that many values.
+    * ``d``: a four byte length followed by that many key-value pairs.
+
+This module does not depend on the CLR, so it can be imported by
+clients without loading any assemblies.
+
+"""
+
+import socket
+import struct
+from typing import Any, Tuple
+
+_length = struct.Struct("!I")
+_int = struct.Struct("!q")
+_float = struct.Struct("!d")
+
+
+def encode(value: Any) -> bytes:
+    """Encode a value."""
+    parts = list()
+    _encode(value, parts)
+    return b"".join(parts)
+
+
+def decode(data: bytes) -> Any:
+    """Decode a value."""
+    value, _ = _decode(memoryview(data), 0)
+    return value
+
+
+def send(connection: socket.socket, value: Any):
+    """Send a single value as a frame."""
+    data = encode(value)
+    connection.sendall(_length.pack(len(data)) + data)
+
+
+def receive(connection: socket.socket) -> Any:
+    """Receive a single frame.
+
+    Raises:
+        EOFError: If the connection is closed before a frame is read.
+
+    """
+    (length,) = _length.unpack(_receive_exactly(connection, _length.size))
+    return decode(_receive_exactly(connection, length))
+
+
+def _receive_exactly(connection: socket.socket, n: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < n:
+        chunk = connection.recv(n - len(buffer))
+        if not chunk:
+            raise EOFError("Connection closed.")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def _encode(value: Any, parts: list):
+    if value is None:
+        parts.append(b"N")
+    elif value is True:
+        parts.append(b"T")
+    elif value is False:
+        parts.append(b"F")
+    elif isinstance(value, int):
+        parts.append(b"i" + _int.pack(value))
+    elif isinstance(value, float):
+        parts.append(b"f" + _float.pack(value))
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        parts.append(b"s" + _length.pack(len(data)) + data)
+    elif isinstance(value, (list, tuple)):
+        parts.append(b"l" + _length.pack(len(value)))
+        for item in value:
+            _encode(item, parts)
+    elif isinstance(value, dict):
+        parts.append(b"d" + _length.pack(len(value)))
+        for key, item in value.items():
+            _encode(key, parts)
+            _encode(item, parts)
+    else:
+        raise TypeError("Cannot encode value of type {}.".format(type(value)))
+
+
+def _decode(data: memoryview, offset: int) -> Tuple[Any, int]:
+    tag = bytes(data[offset : offset + 1])
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return _int.unpack_from(data, offset)[0], offset + _int.size
+    if tag == b"f":
+        return _float.unpack_from(data, offset)[0], offset + _float.size
+    (length,) = _length.unpack_from(data, offset)
+    offset += _length.size
+    if tag == b"s":
+        return str(data[offset : offset + length], "utf-8"), offset + length
+    if tag == b"l":
+        items = list()
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == b"d":
+        items = dict()
+        for _ in range(length):
+            key, offset = _decode(data, offset)
+            items[key], offset = _decode(data, offset)
+        return items, offset
+    raise ValueError("Unknown tag {!r}.".format(tag))
@@ -0,0 +1,175 @@
+"""Combines FlashProfile and FlashFill into pattern-routed programs.
+
+Columns with heterogeneous values, such as dates in different formats,
+require FlashFill to learn a single large conditional program. Instead,
+inputs are first clustered by the patterns that FlashProfile learns on
+them and a small program is learned for each cluster.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+from .matching.text import Pattern, PatternMatcher, learn_patterns
+from .transformation.text import Example, TextTransformationProgram, learn_program
+
+
+class RoutedProgram:
+    """Dispatches each row to the program of the pattern it matches.
+
+    Args:
+        patterns: Patterns that define the clusters.
+        programs: Program for each pattern, or `None` if no program
+            was found for it.
+        column: Index of the input column that is matched.
+        fallback: Program for rows that match no pattern or whose
+            pattern has no program.
+
+    """
+
+    def __init__(
+        self,
+        patterns: List[Pattern],
+        programs: List[Optional[TextTransformationProgram]],
+        column: int = 0,
+        fallback: Optional[TextTransformationProgram] = None,
+    ):
+        self._patterns = patterns
+        self._programs = programs
+        self._column = column
+        self._fallback = fallback
+        self._matcher = PatternMatcher(patterns)
+
+    def __enter__(self) -> "RoutedProgram":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release all patterns and programs."""
+        for pattern in self._patterns:
+            pattern.close()
+        for program in self._programs + [self._fallback]:
+            if program is not None:
+                program.close()
+
+    def __call__(self, row: Union[List[str], str, Example]) -> Optional[str]:
+        """Transform input row.
+
+        Returns:
+            The output of the program of the first pattern that matches
+            the row, or of the fallback program if there is no such
+            program. `None` if there is no fallback program either.
+
+        """
+        program = self.route(row)
+        if program is None:
+            return None
+        return program(row)
+
+    @property
+    def patterns(self) -> List[Pattern]:
+        """Patterns that define the clusters."""
+        return self._patterns
+
+    @property
+    def programs(self) -> List[Optional[TextTransformationProgram]]:
+        """Program for each pattern, `None` if it has no program."""
+        return self._programs
+
+    @property
+    def column(self) -> int:
+        """Index of the input column that is matched."""
+        return self._column
+
+    @property
+    def fallback(self) -> Optional[TextTransformationProgram]:
+        """Program used for rows without a program of their own."""
+        return self._fallback
+
+    def route(
+        self, row: Union[List[str], str, Example]
+    ) -> Optional[TextTransformationProgram]:
+        """Find the program for a row."""
+        if isinstance(row, Example):
+            row = row.input
+        if isinstance(row, str):
+            row = [row]
+        i = self._matcher(row[self._column])
+        if i is None or self._programs[i] is None:
+            return self._fallback
+        return self._programs[i]
+
+    def run(self, rows: Iterable[Union[List[str], str]]) -> List[Optional[str]]:
+        """Transform many input rows.
+
+        Rows are routed in a single pass, after which each program
+        transforms all of its rows in one batch.
+
+        """
+        rows = [[row] if isinstance(row, str) else row for row in rows]
+        routes = dict()
+        for j, row in enumerate(rows):
+            program = self.route(row)
+            if program is not None:
+                routes.setdefault(id(program), (program, list()))[1].append(j)
+        outputs = [None] * len(rows)
+        for program, indices in routes.values():
+            for j, output in zip(indices, program.run(rows[j] for j in indices)):
+                outputs[j] = output
+        return outputs
+
+
+def learn_routed_program(
+    examples: List[Example],
+    column: int = 0,
+    max_patterns: Optional[int] = None,
+    workers: Optional[int] = None,
+    fallback: bool = False,
+) -> RoutedProgram:
+    """Learn one program per cluster of inputs.
+
+    Patterns are learned on the values of `column` of all examples. Each
+    example is assigned to the first pattern that it matches and programs
+    for all clusters are learned concurrently. Clusters without any
+    input-output examples do not get a program.
+
+    Args:
+        examples: List of examples.
+        column: Index of the input column to cluster on.
+        max_patterns: Maximal number of clusters, see
+            :func:`pyprose.matching.text.learn_patterns`.
+        workers: Maximal number of programs learned at the same time.
+        fallback: Whether to also learn a program on all examples, used
+            for rows that match no pattern or whose cluster has no
+            program. This learns the large program that routing avoids,
+            so rows without a program are transformed into `None` by
+            default.
+
+    """
+    patterns = learn_patterns(
+        [example.input[column] for example in examples], max_patterns=max_patterns
+    )
+    matcher = PatternMatcher(patterns)
+    clusters = [list() for _ in patterns]
+    for example in examples:
+        i = matcher(example.input[column])
+        if i is not None:
+            clusters[i].append(example)
+    if fallback:
+        clusters.append(examples)
+
+    def learn(cluster: List[Example]) -> Optional[TextTransformationProgram]:
+        if not any(example.has_output() for example in cluster):
+            return None
+        return learn_program(cluster)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        programs = list(executor.map(learn, clusters))
+    return RoutedProgram(
+        patterns,
+        programs[: len(patterns)],
+        column,
+        programs[-1] if fallback else None,
+    )
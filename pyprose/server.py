@@ -0,0 +1,204 @@
+"""Daemon that keeps PROSE loaded and answers synthesis requests.
+
+Starting the CLR, loading the assemblies and JIT compiling PROSE make
+the first synthesis call in a process slow. The server pays this once
+and then serves requests from :class:`pyprose.client.Client` over a
+Unix socket, each connection in its own thread.
+
+Start it with
+
+    python -m pyprose.server --socket /tmp/pyprose.sock
+
+Learned programs are kept by the server until they are released by the
+client or the connection that learned them is closed.
+
+"""
+
+import os
+import socketserver
+import stat
+import tempfile
+import getpass
+import threading
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from . import protocol
+
+# number of examples sent for each pattern unless requested otherwise
+DEFAULT_MAX_EXAMPLES = 10
+
+
+def default_socket() -> str:
+    """Path of the socket used if none is given, unique for each user.
+
+    Falls back to the user id if the user has no name, which happens in
+    containers without an entry in the password database.
+
+    """
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = str(os.getuid())
+    return str(Path(tempfile.gettempdir()) / "pyprose-{}.sock".format(user))
+
+
+class ProseServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server with loaded PROSE DSLs.
+
+    The socket is only accessible by the user running the server.
+    A stale socket at `path` is removed, but any other file is left
+    alone.
+
+    Args:
+        path: Path of the Unix socket, :func:`default_socket` if not given.
+
+    Raises:
+        FileExistsError: If `path` exists and is not a socket.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: Optional[str] = None):
+        from . import warmup
+        from .matching import text as matching
+        from .transformation import text as transformation
+
+        self.warmup_timings = warmup()
+        self.matching = matching
+        self.transformation = transformation
+        self.programs = dict()
+        self._ids = count()
+        self._lock = threading.Lock()
+        path = path or default_socket()
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError("{} exists and is not a socket.".format(path))
+            os.remove(path)
+        super().__init__(path, _Handler)
+
+    def server_bind(self):
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+
+    def add_program(self, program: Any) -> int:
+        with self._lock:
+            i = next(self._ids)
+            self.programs[i] = program
+        return i
+
+    def get_program(self, i: int) -> Any:
+        with self._lock:
+            return self.programs[i]
+
+    def release_program(self, i: int):
+        with self._lock:
+            program = self.programs.pop(i, None)
+        if program is not None:
+            program.close()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.lexists(self.server_address) and stat.S_ISSOCK(
+            os.lstat(self.server_address).st_mode
+        ):
+            os.remove(self.server_address)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Handle all requests of a single connection."""
+
+    def setup(self):
+        self.owned = set()
+        self.operations: Dict[str, Callable[..., Any]] = {
+            "learn_program": self.learn_program,
+            "run_program": self.run_program,
+            "release_program": self.release_program,
+            "learn_patterns": self.learn_patterns,
+        }
+
+    def handle(self):
+        while True:
+            try:
+                request = protocol.receive(self.request)
+            except EOFError:
+                return
+            try:
+                operation, *arguments = request
+                response = ["ok", self.operations[operation](*arguments)]
+            except Exception as e:
+                response = ["error", "{}: {}".format(type(e).__name__, e)]
+            protocol.send(self.request, response)
+
+    def finish(self):
+        for i in self.owned:
+            self.server.release_program(i)
+
+    def learn_program(self, examples: List[List[Any]]):
+        transformation = self.server.transformation
+        program = transformation.learn_program(
+            [transformation.Example(i, o) for i, o in examples]
+        )
+        if program is None:
+            return None
+        i = self.server.add_program(program)
+        self.owned.add(i)
+        return [i, program.uses_columns]
+
+    def run_program(self, i: int, rows: List[Any]):
+        self.check_owned(i)
+        program = self.server.get_program(i)
+        return list(program.run(rows))
+
+    def release_program(self, i: int):
+        self.check_owned(i)
+        self.owned.discard(i)
+        self.server.release_program(i)
+
+    def check_owned(self, i: int):
+        """Only the connection that learned a program can use it."""
+        if i not in self.owned:
+            raise KeyError("No program {} on this connection.".format(i))
+
+    def learn_patterns(self, strings: List[str], options: Dict[str, Any]):
+        matching = self.server.matching
+        options.setdefault("max_examples", DEFAULT_MAX_EXAMPLES)
+        if options.get("allowed_tokens") is not None:
+            options["allowed_tokens"] = matching.TokenSet(
+                matching.Token(*token) for token in options["allowed_tokens"]
+            )
+        return [
+            {
+                "regex": pattern.regex,
+                "exclude": pattern.exclude,
+                "description": pattern.description,
+                "matching_fraction": pattern.matching_fraction,
+                "examples": pattern.examples,
+            }
+            for pattern in matching.learn_patterns(strings, **options)
+        ]
+
+
+def serve(path: Optional[str] = None):
+    """Serve requests on `path` until interrupted."""
+    with ProseServer(path) as server:
+        for dsl, seconds in server.warmup_timings.items():
+            print("> Warmed up {} in {:.2f}s.".format(dsl, seconds))
+        print("> Serving on {}.".format(server.server_address))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", help="Socket path.")
+    args = parser.parse_args()
+
+    serve(args.socket)
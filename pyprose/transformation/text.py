@@ -4,9 +4,24 @@
    examples." ACM Sigplan Notices 46.1 (2011): 317-330.
 
 """
-from typing import List, Optional, Union, Any
+import re
+import random
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    Any,
+)
 
-from ..core import ProseProgram
+from ..core import ProseProgram, closing_session
 from ..dependencies import load
 
 dependencies = {
@@ -74,7 +89,60 @@ class TextTransformationProgram(ProseProgram):
     @property
     def uses_columns(self) -> List[int]:
         """Indices of input columns used by this transformation program."""
-        return list(map(int, self._program.ColumnsUsed))
+        return list(map(int, self.program.ColumnsUsed))
+
+    def run(self, rows: Iterable[Union[List[str], str]]) -> Iterator[Optional[str]]:
+        """Lazily transform many input rows.
+
+        Rows are projected to the columns used by this program
+        before being passed to PROSE.
+
+        Args:
+            rows: Rows represented as lists of values or single values.
+
+        """
+        used = self.uses_columns
+        cells = (
+            tuple(([row] if isinstance(row, str) else row)[i] for i in used)
+            for row in rows
+        )
+        return self._run_projected(used, cells)
+
+    def run_columns(self, columns: Sequence[Sequence[str]]) -> Iterator[Optional[str]]:
+        """Lazily transform input given as columns.
+
+        Only the columns used by this program are read, so other
+        columns of a columnar source are never accessed.
+
+        Args:
+            columns: Input columns, all of the same length.
+
+        """
+        if not columns:
+            return iter(())
+        used = self.uses_columns
+        if used:
+            cells = zip(*(columns[i] for i in used))
+        else:
+            cells = repeat((), len(columns[0]))
+        return self._run_projected(used, cells)
+
+    def _run_projected(
+        self, used: List[int], cells: Iterable[Sequence[str]]
+    ) -> Iterator[Optional[str]]:
+        """Run on rows given by the values of the `used` columns only.
+
+        PROSE identifies columns by position, so unused columns up
+        to the last used one are passed as empty strings.
+
+        """
+        program = self.program
+        width = max(used, default=-1) + 1
+        for values in cells:
+            row = [""] * width
+            for i, value in zip(used, values):
+                row[i] = value
+            yield program.Run(InputRow(row))
 
 
 def make_examples(data: Any) -> List[Example]:
@@ -118,17 +186,47 @@ def make_examples(data: Any) -> List[Example]:
     return examples
 
 
-def learn_program(examples: List[Example]) -> Optional[TextTransformationProgram]:
+def learn_program(
+    examples: List[Example],
+    strategy: str = "all",
+    initial: int = 3,
+    max_iterations: int = 20,
+) -> Optional[TextTransformationProgram]:
     """Learn a single program.
 
+    With the ``"cegis"`` strategy, a program is first learned from a
+    small and diverse subset of the input-output examples. It is then
+    checked on all input-output examples and some of those on which it
+    fails are added to the subset, until a program is found that is
+    consistent with all of them. This is much faster on large sets of
+    examples that only contain a few different behaviours. If no new
+    examples can be added or after `max_iterations` rounds, a program
+    is learned from all examples instead.
+
     Args:
         examples: List of examples.
+        strategy: Either ``"all"`` to use all examples at once, or
+            ``"cegis"`` to only use examples as they are needed.
+        initial: Number of input-output examples to start from when
+            using the ``"cegis"`` strategy, also the maximal number of
+            examples added in each round.
+        max_iterations: Maximal number of rounds of the ``"cegis"``
+            strategy.
 
     Returns:
         A transformation program if one is found, `None` otherwise.
 
     """
-    program = _make_session(examples).Learn()
+    if strategy == "cegis":
+        if initial < 1:
+            raise ValueError(
+                "Need at least one initial example, got {}.".format(initial)
+            )
+        return _learn_program_cegis(examples, initial, max_iterations)
+    if strategy != "all":
+        raise ValueError("Unknown strategy {}.".format(strategy))
+    with closing_session(_make_session(examples)) as session:
+        program = session.Learn()
     if program is None:
         return None
     return TextTransformationProgram(program, _run_program)
@@ -144,38 +242,205 @@ def learn_programs(
     programs if not enough are found.
 
     """
-    return [
-        TextTransformationProgram(program, _run_program)
-        for program in _make_session(examples).LearnTopK(k)
-    ]
+    with closing_session(_make_session(examples)) as session:
+        return [
+            TextTransformationProgram(program, _run_program)
+            for program in session.LearnTopK(k)
+        ]
+
+
+def learn_distinct_programs(
+    examples: List[Example],
+    k: int = 1,
+    inputs: Optional[List[Union[List[str], str, Example]]] = None,
+    max_inputs: int = 100,
+) -> List[Tuple[TextTransformationProgram, int]]:
+    """Learn top-`k` ranked programs and keep one per behaviour.
+
+    See :func:`learn_programs` and :func:`deduplicate_programs`.
+
+    Args:
+        examples: List of examples.
+        k: Number of programs to learn.
+        inputs: Additional inputs to compare behaviour on.
+        max_inputs: Maximal number of additional inputs used.
+
+    Returns:
+        Pairs of a program and the number of programs that behave like it.
+
+    """
+    candidates = list(examples)
+    if inputs is not None:
+        if len(inputs) > max_inputs:
+            inputs = random.Random(0).sample(inputs, max_inputs)
+        candidates.extend(inputs)
+    return deduplicate_programs(learn_programs(examples, k), candidates)
+
+
+def deduplicate_programs(
+    programs: List[TextTransformationProgram],
+    inputs: List[Union[List[str], str, Example]],
+) -> List[Tuple[TextTransformationProgram, int]]:
+    """Group programs that produce the same outputs on inputs.
 
+    Each program is executed on all inputs in a single batch through
+    :meth:`TextTransformationProgram.run`, so only the columns it uses
+    are passed to PROSE.
 
-def flashfill(data: List[List[str]]) -> List[List[str]]:
+    Args:
+        programs: Programs to group, ordered by preference.
+        inputs: Inputs on which programs are compared.
+
+    Returns:
+        Pairs of the first program of each group and the size of
+        that group, in order of the first program.
+
+    """
+    rows = [i.input if isinstance(i, Example) else i for i in inputs]
+    classes: Dict[Tuple[Optional[str], ...], List] = dict()
+    for program in programs:
+        outputs = tuple(program.run(rows))
+        if outputs in classes:
+            classes[outputs][1] += 1
+        else:
+            classes[outputs] = [program, 1]
+    return [(program, size) for program, size in classes.values()]
+
+
+def flashfill(data: List[List[str]], outputs: int = 1) -> List[List[str]]:
     """Emulate spreadsheet environment.
 
     Rows that are incomplete are filled by learning a program
-    on other rows.
+    on other rows. The last `outputs` columns are filled, each
+    by its own program. Programs are learned concurrently and
+    all columns are filled in a single pass over the rows.
+    Rows without a value for every input column are left alone.
 
     Args:
         data: A table as a list of lists.
+        outputs: Number of output columns at the end of the table.
 
     Returns:
         The input data, but with incomplete rows filled.
 
+    Raises:
+        ValueError: If there is not at least one input column and one
+            output column.
+
     """
-    examples = make_examples(data)
-    program = learn_program(examples)
-    for i, example in enumerate(examples):
-        if not example.has_output():
-            output = program(example)
-            line = data[i]
-            if len(line) == len(example.input):
-                line.append(output)
+    n = max(map(len, data))
+    if not 1 <= outputs < n:
+        raise ValueError(
+            "Expected between 1 and {} output columns, got {}.".format(n - 1, outputs)
+        )
+    m = n - outputs
+    rows = [line for line in data if len(line) >= m]
+    inputs = [line[:m] for line in rows]
+
+    def learn(column: int) -> Optional[TextTransformationProgram]:
+        examples = list()
+        for line, i in zip(rows, inputs):
+            if _has_value(line, column):
+                examples.append(Example(i, line[column]))
             else:
-                line[-1] = output
+                examples.append(Example(i))
+        return learn_program(examples)
+
+    with ThreadPoolExecutor(max_workers=outputs) as executor:
+        programs = list(executor.map(learn, range(m, n)))
+
+    # outputs of each program are computed lazily in a single batch
+    missing = [[not _has_value(line, c) for c in range(m, n)] for line in rows]
+    results = [
+        iter(()) if program is None else program.run(_masked(inputs, missing, k))
+        for k, program in enumerate(programs)
+    ]
+    for line, mask in zip(rows, missing):
+        for k, column in enumerate(range(m, n)):
+            if programs[k] is None or not mask[k]:
+                continue
+            output = next(results[k])
+            if len(line) <= column:
+                line.extend([None] * (column + 1 - len(line)))
+            line[column] = output
     return data
 
 
+def _masked(
+    rows: List[List[str]], masks: List[List[bool]], k: int
+) -> Iterator[List[str]]:
+    """Rows for which the `k`-th value of their mask is set."""
+    return (row for row, mask in zip(rows, masks) if mask[k])
+
+
+def _has_value(line: List[str], column: int) -> bool:
+    return len(line) > column and line[column] != "" and line[column] is not None
+
+
+def warmup():
+    """Run a tiny synthesis and execution, see :func:`pyprose.warmup`."""
+    learn_program([Example("Kettil Hansson", "Hansson, K.")])("Etelka Bala")
+
+
+def _learn_program_cegis(
+    examples: List[Example], initial: int, max_iterations: int
+) -> Optional[TextTransformationProgram]:
+    """Learn a program, adding counterexamples when needed."""
+    inputs = [example for example in examples if not example.has_output()]
+    labelled = [example for example in examples if example.has_output()]
+    used = _diverse(labelled, initial)
+    for _ in range(max_iterations):
+        program = learn_program(inputs + [labelled[i] for i in sorted(used)])
+        if program is None:
+            return None
+        outputs = program.run(example.input for example in labelled)
+        failing = [
+            i
+            for i, (example, output) in enumerate(zip(labelled, outputs))
+            if output != example.output
+        ]
+        if not failing:
+            return program
+        # examples that are already used can still fail if execution
+        # disagrees with synthesis, so only add new ones
+        failing = [i for i in failing if i not in used]
+        if not failing:
+            break
+        counterexamples = _diverse([labelled[i] for i in failing], initial)
+        used.update(failing[i] for i in counterexamples)
+    return learn_program(examples)
+
+
+def _diverse(examples: List[Example], k: int) -> Set[int]:
+    """Indices of at most `k` examples that differ in shape.
+
+    Examples are first taken with a different shape, obtained by
+    replacing letters and digits by a single class character, and
+    remaining slots are filled in order.
+
+    """
+    chosen = dict()
+    for i, example in enumerate(examples):
+        if len(chosen) >= k:
+            break
+        shape = _shape(example)
+        if shape not in chosen:
+            chosen[shape] = i
+    indices = set(chosen.values())
+    for i in range(len(examples)):
+        if len(indices) >= k:
+            break
+        indices.add(i)
+    return indices
+
+
+def _shape(example: Example) -> Tuple[str, ...]:
+    return tuple(
+        re.sub(r"[a-zA-Z]+", "a", re.sub(r"[0-9]+", "0", value))
+        for value in list(example.input) + [example.output]
+    )
+
+
 def _make_session(examples: List[Example]) -> List[Program]:
     session = Session()
     for example in examples:
@@ -1,4 +1,15 @@
-from pyprose.matching.text import learn_patterns, Token
+import pytest
+
+from pyprose.matching.text import (
+    learn_patterns,
+    learn_pattern_hierarchy,
+    extract_spans,
+    PatternMatcher,
+    Token,
+    TokenSet,
+    _to_bytes_regex,
+    DEFAULT_MAX_EXAMPLES,
+)
 
 
 def test_match_dates():
@@ -52,6 +63,53 @@ def test_match_dates():
             pattern.extract("I was born on 25 December 1992 and not in 1993")
         )
     assert extracted == {"1992", "1993", "25 December 1992"}
+    text = b"I was born on 25 December 1992 and not in 1993"
+    spans = list(extract_spans(patterns, text, overlapping=True))
+    assert spans == sorted(spans)
+    assert {text[start:end] for start, end, _ in spans} == {
+        b"1992",
+        b"1993",
+        b"25 December 1992",
+    }
+    spans = list(extract_spans(patterns, text))
+    assert spans == sorted(spans)
+    assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+    assert {text[start:end] for start, end, _ in spans} <= {
+        b"1992",
+        b"1993",
+        b"25 December 1992",
+    }
+
+
+def test_pattern_matcher():
+    patterns = learn_patterns(["1992", "2003", "January"])
+    matcher = PatternMatcher(patterns)
+    for string in ["1992", "January", "Anything"]:
+        expected = next((i for i, p in enumerate(patterns) if p.matches(string)), None)
+        assert matcher(string) == expected
+
+
+def test_bytes_regex():
+    import re
+
+    text = "é1 àb".encode("utf-8")
+    spans = [m.span() for m in re.finditer(_to_bytes_regex("[^0-9 ]+"), text)]
+    assert spans == [(0, 2), (4, 7)]
+    assert re.findall(_to_bytes_regex("[^a-]+"), b"xyz-bc") == [b"xyz", b"bc"]
+    assert re.findall(_to_bytes_regex("[^]a]+"), b"x]ya") == [b"x", b"y"]
+    for regex in ["[éà]+", "[\\W]"]:
+        with pytest.raises(ValueError):
+            _to_bytes_regex(regex)
+
+
+def test_spans_non_ascii():
+    patterns = learn_patterns(["1992", "2001"])
+    text = "é 1992 à2001".encode("utf-8")
+    assert [span for pattern in patterns for span in pattern.spans(text)] == [
+        (3, 7),
+        (10, 14),
+    ]
+    assert [span[:2] for span in extract_spans(patterns, text)] == [(3, 7), (10, 14)]
 
 
 def test_tokens():
@@ -61,6 +119,15 @@ def test_tokens():
     #     assert pattern.tokens[0].Name == "P"
 
 
+def test_token_set():
+    tokens = TokenSet([Token.from_characters("0123456789", "Num", "digit")])
+    assert len(tokens) == 1
+    assert tokens.to_prose() is tokens.to_prose()
+    for strings in (["1992", "2001"], ["12", "345"]):
+        patterns = learn_patterns(strings, allowed_tokens=tokens)
+        assert all(any(p.matches(s) for p in patterns) for s in strings)
+
+
 def test_same_cluster():
     strings = ["1992", "2003", "January"]
     patterns1 = learn_patterns(strings)
@@ -81,8 +148,54 @@ def test_different_cluster():
     print(patterns2)
 
 
+def test_max_examples():
+    strings = ["1992", "2001", "1995", "1885"]
+    patterns = learn_patterns(strings, max_examples=2)
+    assert len(patterns) == 1
+    assert len(patterns[0].examples) == 2
+    assert patterns[0].example in strings
+    assert set(patterns[0].iter_examples()) <= set(strings)
+    assert patterns[0].matches("2020")
+    assert patterns[0].matching_fraction == 1.0
+    with patterns[0] as pattern:
+        assert pattern.matches("2020")
+    with pytest.raises(ValueError):
+        pattern.matches("2020")
+
+    strings = [str(year) for year in range(1900, 2000)]
+    assert len(learn_patterns(strings)[0].examples) == DEFAULT_MAX_EXAMPLES
+    assert len(learn_patterns(strings, max_examples=None)[0].examples) == 100
+
+
+def test_max_patterns():
+    strings = ["1992", "2003", "January", "Feb-03"]
+    hierarchy = learn_pattern_hierarchy(strings, max_patterns=1)
+    assert len(hierarchy.patterns) == 1
+    assert len(hierarchy[0]) > 1
+    assert len(hierarchy.at_most(2)) <= 2
+    assert all(hierarchy.patterns[0].matches(s) for s in strings)
+    assert len(hierarchy.children(hierarchy.patterns[0])) == 2
+    assert len(learn_patterns(strings, max_patterns=2)) <= 2
+
+
+def test_max_patterns_constraints():
+    strings = ["1992", "2001", "1995", "January"]
+    hierarchy = learn_pattern_hierarchy(
+        strings, max_patterns=1, in_different_clusters=[["1992", "January"]]
+    )
+    for pattern in hierarchy.patterns:
+        assert not (pattern.matches("1992") and pattern.matches("January"))
+
+
 if __name__ == "__main__":
     test_match_dates()
+    test_pattern_matcher()
+    test_bytes_regex()
+    test_spans_non_ascii()
     test_tokens()
+    test_token_set()
     test_same_cluster()
     test_different_cluster()
+    test_max_examples()
+    test_max_patterns()
+    test_max_patterns_constraints()
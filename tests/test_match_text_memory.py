@@ -0,0 +1,64 @@
+import gc
+import os
+import sys
+
+import pytest
+
+from pyprose.matching.text import learn_patterns
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc/self/statm"
+)
+
+
+def _resident_size() -> int:
+    """Resident set size of this process in bytes."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _collect():
+    from System import GC  # type: ignore
+
+    gc.collect()
+    GC.Collect()
+    GC.WaitForPendingFinalizers()
+
+
+def _growth(profile):
+    """Growth of resident size over many calls after warming up,
+    and the resident size after warming up."""
+    profile(500)
+    _collect()
+    before = _resident_size()
+    profile(2000)
+    _collect()
+    return _resident_size() - before, before
+
+
+STRINGS = ["21-Feb-73", "2 January 1920", "4 July 1767", "1892", "Unknown"]
+
+
+def test_memory_flat():
+    def profile(n):
+        for i in range(n):
+            learn_patterns(STRINGS + [str(i)])
+
+    growth, before = _growth(profile)
+    assert growth < max(0.1 * before, 32 * 2 ** 20)
+
+
+def test_memory_flat_closed():
+    def profile(n):
+        for i in range(n):
+            for pattern in learn_patterns(STRINGS + [str(i)]):
+                with pattern:
+                    pattern.description
+
+    growth, before = _growth(profile)
+    assert growth < max(0.1 * before, 32 * 2 ** 20)
+
+
+if __name__ == "__main__":
+    test_memory_flat()
+    test_memory_flat_closed()
@@ -0,0 +1,36 @@
+from pyprose.routing import learn_routed_program
+from pyprose.transformation.text import Example
+
+
+def test_mixed_dates():
+    examples = [
+        Example("21-Feb-1973", "1973"),
+        Example("9-Jul-2001", "2001"),
+        Example("2 January 1920", "1920"),
+        Example("11 August 1897", "1897"),
+        Example("17-Sep-2008"),
+        Example("4 July 1767"),
+    ]
+    program = learn_routed_program(examples)
+    assert len(program.patterns) > 1
+    assert program("10-May-1935") == "1935"
+    assert program("24 July 1802") == "1802"
+    assert list(program.run(["7-Jun-1952", "9 May 1828"])) == ["1952", "1828"]
+    assert program.fallback is None
+    assert program("Unknown 1850") is None
+
+
+def test_mixed_dates_fallback():
+    examples = [
+        Example("21-Feb-1973", "1973"),
+        Example("2 January 1920", "1920"),
+        Example("11 August 1897", "1897"),
+    ]
+    program = learn_routed_program(examples, fallback=True)
+    assert program.fallback is not None
+    assert program("Unknown 1850") == program.fallback("Unknown 1850")
+
+
+if __name__ == "__main__":
+    test_mixed_dates()
+    test_mixed_dates_fallback()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from pyprose import protocol
+from pyprose.client import Client, ServerError
+
+
+def test_protocol():
+    value = [None, True, False, -3, 2.5, "é", ["a", []], {"a": [1, "b"]}]
+    assert protocol.decode(protocol.encode(value)) == value
+
+
+def test_default_socket(monkeypatch):
+    from pyprose import server
+
+    def getuser():
+        raise KeyError("getpwuid(): uid not found")
+
+    monkeypatch.setattr(server.getpass, "getuser", getuser)
+    assert server.default_socket().endswith("pyprose-{}.sock".format(os.getuid()))
+
+
+def test_server():
+    from pyprose.server import ProseServer
+
+    path = str(Path(tempfile.mkdtemp()) / "pyprose.sock")
+    server = ProseServer(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with Client(path) as client:
+            program = client.learn_program([("Kettil Hansson", "Hansson, K.")])
+            assert program(["Etelka Bala"]) == "Bala, E."
+            assert program.run(["Myron Lampros"]) == ["Lampros, M."]
+            with Client(path) as other:
+                with pytest.raises(ServerError):
+                    other.request("run_program", program._id, [["Etelka Bala"]])
+                with pytest.raises(ServerError):
+                    other.request("release_program", program._id)
+            program.close()
+            with pytest.raises(ServerError):
+                program(["Etelka Bala"])
+            patterns = client.learn_patterns(["1992", "2001", "1995"])
+            assert len(patterns) == 1
+            assert patterns[0].matches("2020")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_keeps_files():
+    from pyprose.server import ProseServer
+
+    path = Path(tempfile.mkdtemp()) / "file"
+    path.write_text("keep")
+    with pytest.raises(FileExistsError):
+        ProseServer(str(path))
+    assert path.read_text() == "keep"
+
+
+if __name__ == "__main__":
+    test_protocol()
+    test_server()
+    test_server_keeps_files()
@@ -1,6 +1,9 @@
+import pytest
+
 from pyprose.transformation.text import (
     learn_program,
     learn_programs,
+    learn_distinct_programs,
     make_examples,
     flashfill,
     Example,
@@ -11,6 +14,9 @@ def test_format_name():
     program = learn_program([Example("Kettil Hansson", "Hansson, K.")])
     assert program(["Etelka Bala"]) == "Bala, E."
     assert program(["Myron Lampros"]) == "Lampros, M."
+    program.close()
+    with pytest.raises(ValueError):
+        program(["Myron Lampros"])
 
 
 def test_normalize_phone_number():
@@ -21,6 +27,8 @@ def test_normalize_phone_number():
     program = learn_program(examples)
     assert program("425 233 1234") == "425-233-1234"
     assert program("(425) 777 3333") == "425-777-3333"
+    with pytest.raises(ValueError):
+        learn_program(examples, strategy="cegis", initial=0)
 
 
 def test_merge_names():
@@ -33,6 +41,29 @@ def test_merge_names():
     assert program(["Myron", "Lampros"]) == "Lampros, Myron"
 
 
+def test_run_projected():
+    examples = [
+        Example(["1", "Kettil", "x", "Hansson", "y"], "Hansson, Kettil"),
+        Example(["2", "Greta", "x", "Hermansson", "y"]),
+    ]
+    program = learn_program(examples)
+    assert sorted(program.uses_columns) == [1, 3]
+    rows = [["3", "Etelka", "z", "Bala", "z"], ["4", "Myron", "z", "Lampros", "z"]]
+    assert list(program.run(rows)) == ["Bala, Etelka", "Lampros, Myron"]
+    columns = [list(column) for column in zip(*rows)]
+    assert list(program.run_columns(columns)) == ["Bala, Etelka", "Lampros, Myron"]
+    assert list(program.run_columns([])) == []
+
+
+def test_cegis_normalize_phone_number():
+    numbers = [("425", "829", "5512"), ("206", "555", "0100")] * 20
+    examples = [Example("({}) {} {}".format(*n), "-".join(n)) for n in numbers]
+    examples += [Example("-".join(n), "-".join(n)) for n in numbers[:2]]
+    program = learn_program(examples, strategy="cegis", initial=1)
+    assert all(program(e.input) == e.output for e in examples)
+    assert program("(425) 777 3333") == "425-777-3333"
+
+
 def test_top_10_normalize_phone_number():
     examples = [Example("(425) 829 5512", "425-829-5512")]
     programs = learn_programs(examples, k=10)
@@ -40,6 +71,13 @@ def test_top_10_normalize_phone_number():
     assert programs[0]("425 233 1234") == "425-233-1234"
 
 
+def test_distinct_normalize_phone_number():
+    examples = [Example("(425) 829 5512", "425-829-5512")]
+    programs = learn_distinct_programs(examples, k=10, inputs=["425 233 1234"])
+    assert sum(size for _, size in programs) == len(learn_programs(examples, k=10))
+    assert programs[0][0]("425 233 1234") == "425-233-1234"
+
+
 def test_make_examples():
     examples1 = make_examples(
         [
@@ -72,10 +110,44 @@ def test_flashfill():
     assert table[2][2] == "Lampros, M."
 
 
+def test_flashfill_multiple_outputs():
+    table = [
+        ["Greta", "Hermansson", "Hermansson, G.", "G.H."],
+        ["Kettil", "Hansson", "Hansson, K.", "K.H."],
+        ["Myron", "Lampros"],
+        ["Etelka", "Bala", "Bala, E."],
+    ]
+    flashfill(table, outputs=2)
+    assert table[2][2:] == ["Lampros, M.", "M.L."]
+    assert table[3][2:] == ["Bala, E.", "E.B."]
+    for outputs in (0, 4):
+        with pytest.raises(ValueError):
+            flashfill(table, outputs=outputs)
+
+
+def test_flashfill_short_rows():
+    table = [
+        ["Greta", "Hermansson", "Hermansson, G."],
+        ["Kettil", "Hansson", "Hansson, K."],
+        ["Myron"],
+        [],
+        ["Etelka", "Bala"],
+    ]
+    flashfill(table)
+    assert table[2] == ["Myron"]
+    assert table[3] == []
+    assert table[4][2] == "Bala, E."
+
+
 if __name__ == "__main__":
     test_format_name()
     test_normalize_phone_number()
     test_merge_names()
+    test_run_projected()
+    test_cegis_normalize_phone_number()
     test_top_10_normalize_phone_number()
+    test_distinct_normalize_phone_number()
     test_make_examples()
     test_flashfill()
+    test_flashfill_multiple_outputs()
+    test_flashfill_short_rows()
@@ -0,0 +1,20 @@
+import pytest
+
+import pyprose
+
+
+def test_warmup():
+    timings = pyprose.warmup(dsls=["transformation.text"])
+    assert list(timings) == ["transformation.text"]
+    assert timings["transformation.text"] >= 0
+    assert set(pyprose.warmup()) == set(pyprose.DSLS)
+
+
+def test_warmup_unknown():
+    with pytest.raises(ValueError):
+        pyprose.warmup(dsls=["split.text"])
+
+
+if __name__ == "__main__":
+    test_warmup()
+    test_warmup_unknown()